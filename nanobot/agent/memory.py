@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
     from nanobot.session.manager import Session
@@ -42,25 +56,175 @@ _SAVE_MEMORY_TOOL = [
 ]
 
 
+# Static prompt parts; the stable prefix also helps provider-side prompt caching.
+_CONSOLIDATION_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a memory consolidation agent. Call the save_memory tool with your "
+    "consolidation of the conversation.",
+}
+_PROMPT_PREFIX = (
+    "Process this conversation and call the save_memory tool with your consolidation.\n\n"
+    "## Current Long-term Memory\n"
+)
+_PROMPT_CONVERSATION_HEADER = "\n\n## Conversation to Process\n"
+
+
+def _to_json(value: object) -> str:
+    """Serialize a non-string tool argument, preferring orjson when installed.
+
+    Keys are sorted so the same value always yields the same text (and hence the
+    same MEMORY.md bytes and consolidation prompt on the next round).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+            ).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib json copes
+    try:
+        return json.dumps(value, ensure_ascii=False, sort_keys=True) + "\n"
+    except TypeError:
+        return json.dumps(value, ensure_ascii=False) + "\n"  # mixed int/str keys can't be sorted
+
+
+def _from_json(text: str) -> object:
+    """Parse raw JSON tool arguments, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+_CONSOLIDATION_CACHE_SIZE = 64
+_MAX_PARALLEL_CONSOLIDATIONS = 4
+
+# Token budget for one consolidation prompt: ~80% of a 128k context window,
+# leaving room for the system message and the save_memory tool call.
+_CONSOLIDATION_CONTEXT_TOKENS = 128_000
+_CONSOLIDATION_TOKEN_BUDGET = int(_CONSOLIDATION_CONTEXT_TOKENS * 0.8)
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str):
+    """Return a tiktoken encoding for ``model``, or None when unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model.rsplit("/", 1)[-1])
+    except KeyError:
+        pass  # not an OpenAI model name; cl100k_base is a close enough estimate
+    except Exception:
+        return None  # BPE file could not be downloaded (offline)
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None  # BPE file could not be downloaded (offline)
+
+
+def _format_timestamp(ts: object) -> str:
+    """Minute-precision timestamp for a prompt line; accepts datetime or ISO string."""
+    if isinstance(ts, datetime):
+        return ts.isoformat(timespec="minutes")
+    return str(ts)[:16]
+
+
+def _count_tokens(enc, text: str) -> int:
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def _window_lines(
+    messages: list[dict], start: int, stop: int, model: str, current_memory: str, bounded: bool,
+) -> tuple[list[str], int, int]:
+    """Format ``messages[start:stop]`` as prompt lines until the token budget is spent.
+
+    Meant for a worker thread: loading the encoding may download its BPE file
+    and encoding a full window is CPU-bound.  Returns (lines, tokens, consumed).
+    """
+    enc = _encoding(model)
+    budget = _CONSOLIDATION_TOKEN_BUDGET - _count_tokens(enc, current_memory)
+    lines: list[str] = []
+    used = 0
+    consumed = 0
+    # Index access: islice would step through the whole consolidated prefix
+    for i in range(start, stop):
+        m = messages[i]
+        if m.get("content"):
+            tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
+            line = f"[{_format_timestamp(m.get('timestamp', '?'))}] {m['role'].upper()}{tools}: {m['content']}"
+            tokens = _count_tokens(enc, line)
+            # When bounded, the rest waits for the next consolidation round
+            if bounded and lines and used + tokens > budget:
+                break
+            lines.append(line)
+            used += tokens
+        consumed += 1
+    return lines, used, consumed
+
+
+@dataclass(slots=True)
+class _SavedConsolidation:
+    """Validated save_memory arguments plus which of their writes already landed."""
+
+    args: Mapping[str, Any]
+    history_written: bool = False
+
+
 class MemoryStore:
     """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self, workspace: Path, max_parallel_consolidations: int = _MAX_PARALLEL_CONSOLIDATIONS,
+    ):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        # Parsed save_memory arguments keyed by (model, prompt) digest, so a
+        # retried identical request (e.g. after a failed write) skips the LLM.
+        self._consolidation_cache: OrderedDict[str, _SavedConsolidation] = OrderedDict()
+        # In-memory mirror of MEMORY.md as (mtime_ns, size, text). The agent can
+        # also edit the file with its own tools, so a stat still validates it.
+        self._memory_cache: tuple[int, int, str] | None = None
+        # Background consolidations from many sessions share this store; bound
+        # how many save_memory LLM calls are in flight at once.
+        self._chat_sem = asyncio.Semaphore(max_parallel_consolidations)
 
     def read_long_term(self) -> str:
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        try:
+            st = self.memory_file.stat()
+        except FileNotFoundError:
+            self._memory_cache = None
+            return ""
+        cached = self._memory_cache
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        content = self.memory_file.read_text(encoding="utf-8")
+        self._memory_cache = (st.st_mtime_ns, st.st_size, content)
+        return content
 
     def write_long_term(self, content: str) -> None:
         self.memory_file.write_text(content, encoding="utf-8")
+        st = self.memory_file.stat()
+        self._memory_cache = (st.st_mtime_ns, st.st_size, content)
+
+    def reload(self) -> None:
+        """Drop the MEMORY.md mirror so the next read goes to disk."""
+        self._memory_cache = None
 
     def append_history(self, entry: str) -> None:
-        with open(self.history_file, "a", encoding="utf-8") as f:
-            f.write(entry.rstrip() + "\n\n")
+        data = (entry.rstrip() + "\n\n").encode("utf-8")
+        # A single write() on an O_APPEND descriptor, so entries appended by
+        # concurrent consolidations in worker threads cannot interleave.
+        fd = os.open(self.history_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
 
     def get_memory_context(self) -> str:
         long_term = self.read_long_term()
@@ -80,7 +244,8 @@ class MemoryStore:
         Returns True on success (including no-op), False on failure.
         """
         if archive_all:
-            old_messages = session.messages
+            start, stop = 0, len(session.messages)
+            old_count = stop
             keep_count = 0
             logger.info("Memory consolidation (archive_all): {} messages", len(session.messages))
         else:
@@ -89,60 +254,85 @@ class MemoryStore:
                 return True
             if len(session.messages) - session.last_consolidated <= 0:
                 return True
-            old_messages = session.messages[session.last_consolidated:-keep_count]
-            if not old_messages:
+            # Fixed bounds over the append-only list, so no window copy is needed
+            start, stop = session.last_consolidated, len(session.messages) - keep_count
+            old_count = stop - start
+            if old_count <= 0:
                 return True
-            logger.info("Memory consolidation: {} to consolidate, {} keep", len(old_messages), keep_count)
 
-        lines = []
-        for m in old_messages:
-            if not m.get("content"):
-                continue
-            tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
-            lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
+        current_memory = await asyncio.to_thread(self.read_long_term)
+        # archive_all must take everything, so only the incremental path is bounded
+        lines, used, consumed = await asyncio.to_thread(
+            _window_lines, session.messages, start, stop, model, current_memory, not archive_all,
+        )
 
-        current_memory = self.read_long_term()
-        prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
+        if not archive_all:
+            logger.info(
+                "Memory consolidation: {} of {} to consolidate (~{} tokens), {} keep",
+                consumed, old_count, used, keep_count,
+            )
 
-## Current Long-term Memory
-{current_memory or "(empty)"}
+        prompt = "".join((
+            _PROMPT_PREFIX, current_memory or "(empty)", _PROMPT_CONVERSATION_HEADER, "\n".join(lines),
+        ))
 
-## Conversation to Process
-{chr(10).join(lines)}"""
+        cache_key = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
 
         try:
-            response = await provider.chat(
-                messages=[
-                    {"role": "system", "content": "You are a memory consolidation agent. Call the save_memory tool with your consolidation of the conversation."},
-                    {"role": "user", "content": prompt},
-                ],
-                tools=_SAVE_MEMORY_TOOL,
-                model=model,
-            )
+            saved = self._consolidation_cache.get(cache_key)
+            if saved is not None:
+                self._consolidation_cache.move_to_end(cache_key)
+                logger.debug("Memory consolidation: reusing cached save_memory arguments")
+            else:
+                async with self._chat_sem:
+                    response = await provider.chat(
+                        messages=[
+                            _CONSOLIDATION_SYSTEM_MESSAGE,
+                            {"role": "user", "content": prompt},
+                        ],
+                        tools=_SAVE_MEMORY_TOOL,
+                        model=model,
+                    )
+
+                if not response.has_tool_calls:
+                    logger.warning("Memory consolidation: LLM did not call save_memory, skipping")
+                    return False
 
-            if not response.has_tool_calls:
-                logger.warning("Memory consolidation: LLM did not call save_memory, skipping")
-                return False
+                args = response.tool_calls[0].arguments
+                # Some providers return arguments as a JSON string instead of dict
+                if isinstance(args, str):
+                    args = _from_json(args)
+                if not isinstance(args, dict):
+                    logger.warning("Memory consolidation: unexpected arguments type {}", type(args).__name__)
+                    return False
 
-            args = response.tool_calls[0].arguments
-            # Some providers return arguments as a JSON string instead of dict
-            if isinstance(args, str):
-                args = json.loads(args)
-            if not isinstance(args, dict):
-                logger.warning("Memory consolidation: unexpected arguments type {}", type(args).__name__)
-                return False
+                # Only well-formed arguments are cached; a retry reuses them read-only
+                saved = _SavedConsolidation(MappingProxyType(args))
+                self._consolidation_cache[cache_key] = saved
+                while len(self._consolidation_cache) > _CONSOLIDATION_CACHE_SIZE:
+                    self._consolidation_cache.popitem(last=False)
 
-            if entry := args.get("history_entry"):
+            args = saved.args
+            # Both files are written off the event loop, in parallel
+            writes: dict[str, Awaitable[None]] = {}
+            if (entry := args.get("history_entry")) and not saved.history_written:
                 if not isinstance(entry, str):
-                    entry = json.dumps(entry, ensure_ascii=False)
-                self.append_history(entry)
+                    entry = _to_json(entry)
+                writes["history"] = asyncio.to_thread(self.append_history, entry)
             if update := args.get("memory_update"):
                 if not isinstance(update, str):
-                    update = json.dumps(update, ensure_ascii=False)
+                    update = _to_json(update)
                 if update != current_memory:
-                    self.write_long_term(update)
+                    writes["memory"] = asyncio.to_thread(self.write_long_term, update)
+            results = dict(zip(writes, await asyncio.gather(*writes.values(), return_exceptions=True)))
+            # A retry after a partial failure must not append the same entry twice
+            if "history" in results and not isinstance(results["history"], BaseException):
+                saved.history_written = True
+            for result in results.values():
+                if isinstance(result, BaseException):
+                    raise result
 
-            session.last_consolidated = 0 if archive_all else len(session.messages) - keep_count
+            session.last_consolidated = 0 if archive_all else session.last_consolidated + consumed
             logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
             return True
         except Exception:
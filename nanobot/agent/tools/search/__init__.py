@@ -1,5 +1,6 @@
 """Agent Search tools module."""
 
 from nanobot.agent.tools.search.base import BaseSearchTool
+from nanobot.agent.tools.search.multi import MultiSearchTool
 
-__all__ = ["BaseSearchTool"]
\ No newline at end of file
+__all__ = ["BaseSearchTool", "MultiSearchTool"]
@@ -1,11 +1,39 @@
 """Baidu Search Tool Implementation"""
 
-import os
-from typing import Any
+from typing import Any, AsyncIterator
 import httpx
-from nanobot.agent.tools.search.base import BaseSearchTool
+from nanobot.agent.tools.search.base import BaseSearchTool, json_loads
 from nanobot.config.schema import WebSearchConfig
 
+try:
+    # optional: lets large responses be parsed as they stream off the wire
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _normalize_reference(item: dict[str, Any]) -> dict[str, str]:
+    return {
+        "icon": item.get("icon", ""),
+        "date": item.get("date", ""),
+        "title": item.get("title", ""),
+        "url": item.get("url", ""),
+        "description": item.get("content", ""),
+    }
+
+
+class _ByteStreamReader:
+    """Async file-like adapter over ``httpx`` byte chunks, as ``ijson`` expects."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
 class BaiduSearchTool(BaseSearchTool):
     """Adapter for querying the Baidu web search API.
 
@@ -15,24 +43,28 @@ class BaiduSearchTool(BaseSearchTool):
     may also be supplied through the ``BAIDU_API_KEY`` environment variable.
     """
 
+    url_base = "https://qianfan.baidubce.com/v2/ai_search/web_search"
+
     def __init__(self, config: WebSearchConfig):
         # initialise parent and apply defaults
         self.name = "baidu"
         self.envName = "BAIDU_API_KEY"
         self.limit_results = 50
         super().__init__(config)
-        self.url_base = (
-            self.url_base
-            or "https://qianfan.baidubce.com/v2/ai_search/web_search"
-        )
-
-    def headers(self) -> dict[str, str]:
-        """Return the default HTTP headers required by the API."""
-        return {
+        # static request pieces, built once and reused for every query
+        self._headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._body_template: dict[str, Any] = {
+            "edition": "standard",
+            "search_source": "baidu_search_v2",
+        }
+
+    def headers(self) -> dict[str, str]:
+        """Return the default HTTP headers required by the API."""
+        return self._headers
 
     def body(self, query: str, count: int | None = None, **kwargs: Any) -> dict[str, Any]:
         """Construct the JSON payload for a search request.
@@ -45,13 +77,10 @@ class BaiduSearchTool(BaseSearchTool):
         :return: dictionary ready to be serialized as JSON
         """
 
-        top_k = self.top_k(count)
-        return {
-            "messages": [{"content": query, "role": "user"}],
-            "edition": "standard",
-            "search_source": "baidu_search_v2",
-            "resource_type_filter": [{"type": "web", "top_k": top_k}],
-        }
+        body = self._body_template.copy()
+        body["messages"] = [{"content": query, "role": "user"}]
+        body["resource_type_filter"] = [{"type": "web", "top_k": self.top_k(count)}]
+        return body
 
     async def request(
         self,
@@ -61,38 +90,62 @@ class BaiduSearchTool(BaseSearchTool):
     ) -> list[dict[str, str]]:
         """Perform the HTTP POST and normalise the response.
 
-        Raises an exception if the remote service returns an error code.
+        When ``ijson`` is installed the body is parsed incrementally and only
+        the first ``top_k`` references are materialized.  Raises an exception if
+        the remote service returns an error code.
         """
+        if ijson is not None:
+            async with client.stream(
+                "POST",
+                self.url_base,
+                json=body,
+                headers=headers,
+                timeout=self.timeout,
+            ) as response:
+                response.raise_for_status()
+                top_k = body["resource_type_filter"][0]["top_k"]
+                return await self._parse_stream(response.aiter_bytes(), top_k)
 
         response = await client.post(
             self.url_base,
             json=body,
             headers=headers,
-            timeout=10.0,
+            timeout=self.timeout,
         )
         response.raise_for_status()
 
-        results = response.json()
+        results = json_loads(response.content)
         if "code" in results:
             # the API returns a code/message pair when something went wrong
             raise Exception(f'{results["code"]}: {results.get("message")}')
 
-        references = results.get("references", [])
-        normalized: list[dict[str, str]] = []
-        for item in references:
-            normalized.append(
-                {
-                    "icon": item.get("icon", ""),
-                    "date": item.get("date", ""),
-                    "title": item.get("title", ""),
-                    "url": item.get("url", ""),
-                    "description": item.get("content", ""),
-                }
-            )
-        return normalized
-
-
-        
-        
+        return [_normalize_reference(item) for item in results.get("references", [])]
 
+    @staticmethod
+    async def _parse_stream(chunks: AsyncIterator[bytes], top_k: int) -> list[dict[str, str]]:
+        """Collect up to ``top_k`` normalized references from a streamed body.
 
+        The stream is always read to the end: closing a half-read HTTP/1.1
+        response discards its connection instead of returning it to the pool.
+        """
+        normalized: list[dict[str, str]] = []
+        error: dict[str, Any] = {}
+        builder = None
+        async for prefix, event, value in ijson.parse_async(_ByteStreamReader(chunks)):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "references.item" and event == "end_map":
+                    normalized.append(_normalize_reference(builder.value))
+                    builder = None
+            elif (
+                prefix == "references.item" and event == "start_map" and len(normalized) < top_k
+            ):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in ("code", "message"):
+                error[prefix] = value
+
+        if "code" in error:
+            # the API returns a code/message pair when something went wrong
+            raise Exception(f'{error["code"]}: {error.get("message")}')
+        return normalized
@@ -1,13 +1,138 @@
 """Base interface for search tools."""
 
+import asyncio
+import copy
 import os
+import time
+from collections import OrderedDict
+from weakref import WeakValueDictionary
 
+import httpcore
 import httpx
+from loguru import logger
 
+from nanobot.agent.tools.search.dns import CachingDNSBackend
 from nanobot.config.schema import WebSearchConfig
 from abc import ABC, abstractmethod
 from typing import Any
 
+try:
+    # Private httpx helper; mirrors how httpx itself maps HTTP(S)_PROXY / NO_PROXY
+    from httpx._utils import get_environment_proxies
+except ImportError:
+    get_environment_proxies = None
+
+try:
+    # orjson decodes large result payloads several times faster than stdlib json
+    from orjson import loads as json_loads  # noqa: F401 - re-exported for providers
+except ImportError:
+    from json import loads as json_loads  # noqa: F401
+
+# Default per-stage timeouts: fail fast on slow connects while still giving
+# slow-body APIs a longer read window.  Overridable via WebSearchConfig.
+SEARCH_TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0)
+
+# Process-wide client shared by all search providers so repeat queries reuse
+# pooled keep-alive connections instead of paying a TCP+TLS handshake each time.
+_CLIENT: httpx.AsyncClient | None = None
+
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _make_transport(proxy: str | None = None) -> httpx.AsyncHTTPTransport:
+    # HTTP/2 lets concurrent searches to the same host multiplex on one
+    # keep-alive connection (Brave supports it; others fall back to 1.1).
+    # Transport retries only cover connect errors (resets, DNS hiccups);
+    # 5xx responses are retried in BaseSearchTool._request_with_retry.
+    return httpx.AsyncHTTPTransport(http2=True, retries=2, limits=_LIMITS, proxy=proxy)
+
+
+def _install_dns_cache(transport: httpx.AsyncHTTPTransport) -> None:
+    # httpx does not expose httpcore's network_backend, so swap it on the pool
+    # to keep DNS lookups off the hot path for new connections.  This relies on
+    # httpcore internals; if they move, keep the default backend.
+    pool = getattr(transport, "_pool", None)
+    if isinstance(getattr(pool, "_network_backend", None), httpcore.AsyncNetworkBackend):
+        pool._network_backend = CachingDNSBackend()
+    else:
+        logger.debug("Search client: httpcore pool layout changed, DNS cache disabled")
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared search ``httpx.AsyncClient``, creating it lazily."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        if get_environment_proxies is None:
+            # Without the helper, let httpx build its own transport so it still
+            # applies environment proxies (at the cost of connect retries).
+            logger.debug("Search client: httpx proxy helper unavailable, using default transport")
+            _CLIENT = httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=SEARCH_TIMEOUT)
+            _install_dns_cache(_CLIENT._transport)
+            return _CLIENT
+        transport = _make_transport()
+        _install_dns_cache(transport)
+        # An explicit transport disables httpx's own HTTP(S)_PROXY / NO_PROXY
+        # handling, so mount the environment proxies the same way it would.
+        mounts = {
+            pattern: _make_transport(proxy) if proxy else None
+            for pattern, proxy in get_environment_proxies().items()
+        }
+        _CLIENT = httpx.AsyncClient(transport=transport, mounts=mounts, timeout=SEARCH_TIMEOUT)
+    return _CLIENT
+
+
+async def close_client() -> None:
+    """Close the shared search client; call on shutdown before the loop exits."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.2
+_RETRY_MAX_DELAY = 2.0
+
+# TTL+LRU cache of normalized results keyed by (provider, endpoint, API key,
+# query, top_k), so tools pointed at different endpoints or accounts never
+# serve each other's results.
+# Concurrent identical lookups are coalesced through a per-key lock so N
+# simultaneous requests cost a single HTTP round-trip.
+_CacheKey = tuple[str, str, str, str, int]
+_QUERY_CACHE_MAXSIZE = 512
+_QUERY_CACHE_TTL = 300.0
+_query_cache: OrderedDict[_CacheKey, tuple[float, list[dict]]] = OrderedDict()
+_query_locks: WeakValueDictionary[_CacheKey, asyncio.Lock] = WeakValueDictionary()
+
+
+def _cache_get(key: _CacheKey) -> list[dict] | None:
+    entry = _query_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, results = entry
+    if expires_at <= time.monotonic():
+        del _query_cache[key]
+        return None
+    _query_cache.move_to_end(key)
+    # Deep copies on both sides: a caller mutating its results must not alter
+    # what later cache hits return.
+    return copy.deepcopy(results)
+
+
+def _cache_put(key: _CacheKey, results: list[dict]) -> None:
+    _query_cache[key] = (time.monotonic() + _QUERY_CACHE_TTL, copy.deepcopy(results))
+    _query_cache.move_to_end(key)
+    while len(_query_cache) > _QUERY_CACHE_MAXSIZE:
+        _query_cache.popitem(last=False)
+
+
+def _format_result(i: int, item: dict) -> str:
+    core = f"{i}. {item.get('title', '')}\n   {item.get('url', '')}"
+    desc = item.get("description", "")
+    return f"{core}\n   {desc}" if desc else core
+
+
 class BaseSearchTool(ABC):
     """Abstract interface for wrapping a web search provider.
 
@@ -25,13 +150,20 @@ class BaseSearchTool(ABC):
     api_key: str | None = None
     max_results: int = 5
     limit_results: int = 10
+    timeout: httpx.Timeout = SEARCH_TIMEOUT
 
     def __init__(self, config: WebSearchConfig):
         # copy configuration values; subclasses may override or extend
         self.name = config.provider
-        self.url_base = config.url_base
+        self.url_base = config.url_base or self.url_base
         self.api_key = config.api_key or os.environ.get(self.envName, "")
         self.max_results = config.max_results
+        self.timeout = httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        )
 
     def headers(self) -> dict[str, str]:
         """Return a dictionary of HTTP headers to send with each request.
@@ -64,48 +196,84 @@ class BaseSearchTool(ABC):
         return min(max(count or self.max_results, 1), self.limit_results)
 
     async def queryStringify(
-        self, query: str, count: int | None = None, **kwargs: Any
+        self,
+        query: str,
+        count: int | None = None,
+        *,
+        client: httpx.AsyncClient | None = None,
+        **kwargs: Any,
     ) -> str:
         """Return a formatted string of search results.
 
         The output is crafted to match the format produced by
-        :class:`~nanobot.agent.tools.web.WebSearchTool` 
+        :class:`~nanobot.agent.tools.web.WebSearchTool`.  ``client`` is passed
+        through to :meth:`query`.
         """
         try:
-            results = await self.query(query, count, **kwargs)
+            results = await self.query(query, count, client=client, **kwargs)
         except Exception as e:  # pragma: no cover - simple formatting
             return f"Error: {type(e).__name__}, {e}"
 
         if not results:
             return f"No results for: {query}"
 
-        lines: list[str] = [f"Results for: {query}\n"]
-        for i, item in enumerate(results, 1):
-            title = item.get("title", "")
-            url = item.get("url", "")
-            desc = item.get("description", "")
-            lines.append(f"{i}. {title}\n   {url}")
-            if desc:
-                lines.append(f"   {desc}")
-        return "\n".join(lines)
+        return f"Results for: {query}\n\n" + "\n".join(
+            _format_result(i, item) for i, item in enumerate(results, 1)
+        )
 
     async def query(
-        self, query: str, count: int | None = None, **kwargs: Any
+        self,
+        query: str,
+        count: int | None = None,
+        *,
+        client: httpx.AsyncClient | None = None,
+        **kwargs: Any,
     ) -> list:
         """Execute a query against the configured provider.
 
         Raises an exception if the API key is missing or the network request
         fails.  Delegates header/body generation to ``headers`` and ``body``
-        methods and performs the request using an ``httpx.AsyncClient`` to
-        simplify usage for subclasses.
+        methods and performs the request using ``client`` when given (it is
+        left open for the caller to manage) or else the shared pooled
+        ``httpx.AsyncClient`` returned by :func:`get_client`.  Results are
+        memoized for a few minutes per ``(provider, url_base, api_key, query, top_k)``.
         """
         if not self.api_key:
             raise Exception(f"Error: current provider {self.name} , both config.json[tools.web.search.apiKey] and env[{self.envName}] are not configured")
 
-        headers = self.headers()
-        request_body = self.body(query, count, **kwargs)
-        async with httpx.AsyncClient() as client:
-            return await self.request(client, headers, request_body)
+        key = (self.name, self.url_base, self.api_key, query, self.top_k(count))
+        if (cached := _cache_get(key)) is not None:
+            return cached
+
+        lock = _query_locks.get(key)
+        if lock is None:
+            lock = _query_locks[key] = asyncio.Lock()
+        async with lock:
+            # another waiter may have filled the cache while we were queued
+            if (cached := _cache_get(key)) is not None:
+                return cached
+            headers = self.headers()
+            request_body = self.body(query, count, **kwargs)
+            if client is None:
+                client = await get_client()
+            results = await self._request_with_retry(client, headers, request_body)
+            _cache_put(key, results)
+            return results
+
+    async def _request_with_retry(
+        self, client: httpx.AsyncClient, headers: dict, body: dict
+    ) -> list:
+        """Call :meth:`request`, retrying 5xx responses with exponential backoff."""
+        delay = _RETRY_BASE_DELAY
+        for _ in range(_RETRY_ATTEMPTS - 1):
+            try:
+                return await self.request(client, headers, body)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500:
+                    raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RETRY_MAX_DELAY)
+        return await self.request(client, headers, body)
 
     @abstractmethod
     async def request(
@@ -117,3 +285,47 @@ class BaseSearchTool(ABC):
         assumptions about how the remote API behaves.
         """
         raise NotImplementedError
+
+
+async def query_many(
+    tools: list[BaseSearchTool],
+    query: str,
+    count: int | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> list[list[dict]]:
+    """Run ``query`` against several providers concurrently.
+
+    Total latency is bounded by the slowest provider rather than the sum of
+    all of them.  A provider that raises contributes an empty list so one
+    broken backend does not poison the batch.
+    """
+    results = await asyncio.gather(
+        *(t.query(query, count, client=client) for t in tools), return_exceptions=True
+    )
+    batches: list[list[dict]] = []
+    for tool, r in zip(tools, results):
+        if isinstance(r, BaseException):
+            logger.warning("Search provider {} failed: {!r}", tool.name, r)
+            r = []
+        batches.append(r)
+    return batches
+
+
+def merge_results(batches: list[list[dict]]) -> list[dict]:
+    """Flatten per-provider result lists, dropping duplicate URLs.
+
+    The first occurrence of a URL wins, so provider order expresses priority.
+    Items without a URL are always kept.
+    """
+    seen: set[str] = set()
+    merged: list[dict] = []
+    for batch in batches:
+        for item in batch:
+            url = item.get("url", "")
+            if url:
+                if url in seen:
+                    continue
+                seen.add(url)
+            merged.append(item)
+    return merged
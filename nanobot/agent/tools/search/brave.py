@@ -1,9 +1,8 @@
 """BRAVE Search Tool Implementation"""
 
-import os
 from typing import Any
 import httpx
-from nanobot.agent.tools.search.base import BaseSearchTool
+from nanobot.agent.tools.search.base import BaseSearchTool, json_loads
 from nanobot.config.schema import WebSearchConfig
 
 class BraveSearchTool(BaseSearchTool):
@@ -13,18 +12,18 @@ class BraveSearchTool(BaseSearchTool):
     and provides a minimal interface used by :class:`WebSearchTool`.
     """
 
+    url_base = "https://api.search.brave.com/res/v1/web/search"
+
     def __init__(self, config: WebSearchConfig):
         # initialize base attributes and apply provider-specific defaults
         self.name = "brave"
         self.envName = "BRAVE_API_KEY"
         super().__init__(config)
-        self.url_base = (
-            self.url_base or "https://api.search.brave.com/res/v1/web/search"
-        )
+        self._headers = {"Accept": "application/json", "X-Subscription-Token": self.api_key}
 
     def headers(self) -> dict[str, str]:
         """Return headers required by Brave (subscription token)."""
-        return {"Accept": "application/json", "X-Subscription-Token": self.api_key}
+        return self._headers
 
     def body(self, query: str, count: int | None = None) -> dict[str, Any]:
         """Construct query parameters for the Brave search endpoint."""
@@ -37,20 +36,15 @@ class BraveSearchTool(BaseSearchTool):
 
         The JSON response contains a ``web`` key with ``results``; the method
         extracts and returns that list, defaulting to an empty list on
-        unexpected payloads.
+        unexpected payloads.  ``client`` is the shared pooled client unless
+        the caller injected one, so repeated searches normally reuse the
+        keep-alive HTTP/2 connection.
         """
         r = await client.get(
             self.url_base,
             params=body,
             headers=headers,
-            timeout=10.0,
+            timeout=self.timeout,
         )
         r.raise_for_status()
-        return r.json().get("web", {}).get("results", [])
-
-            
-
-        
-        
-
-
+        return json_loads(r.content).get("web", {}).get("results", [])
@@ -0,0 +1,99 @@
+"""DNS-caching network backend for the shared search client."""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Iterable
+
+import httpcore
+
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+DNS_CACHE_TTL = 300.0
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves hostnames through a TTL cache.
+
+    Lookups go through ``aiodns`` when it is installed and fall back to the
+    event loop's ``getaddrinfo`` otherwise.  Only the TCP connect uses the
+    cached address; TLS still verifies against the original hostname because
+    httpcore passes it as ``server_hostname``.
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        self._backend = httpcore.AnyIOBackend()
+        self._ttl = ttl
+        self._cache: dict[str, tuple[float, str]] = {}
+        self._resolver = None
+
+    async def resolve(self, host: str) -> str:
+        """Return an IP address for ``host``, from cache when still fresh."""
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        entry = self._cache.get(host)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        addr = await self._lookup(host)
+        self._cache[host] = (time.monotonic() + self._ttl, addr)
+        return addr
+
+    async def _lookup(self, host: str) -> str:
+        if aiodns is not None:
+            if self._resolver is None:
+                self._resolver = aiodns.DNSResolver()
+            try:
+                result = await self._resolver.getaddrinfo(host, type=socket.SOCK_STREAM)
+                nodes = result.nodes
+            except aiodns.error.DNSError:
+                nodes = []  # let the system resolver try (hosts file, split DNS)
+            if nodes:
+                node = next((n for n in nodes if n.family == socket.AF_INET), nodes[0])
+                addr = node.addr[0]
+                return addr.decode() if isinstance(addr, bytes) else addr
+
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        return infos[0][4][0]
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addr = await self.resolve(host)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        try:
+            return await self._backend.connect_tcp(
+                addr, port, timeout=timeout, local_address=local_address,
+                socket_options=socket_options,
+            )
+        except httpcore.ConnectError:
+            # the cached address may be stale; resolve again on the next attempt
+            self._cache.pop(host, None)
+            raise
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options,
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
@@ -0,0 +1,29 @@
+"""Fan-out search across several providers."""
+
+from typing import Any
+
+import httpx
+
+from nanobot.agent.tools.search.base import BaseSearchTool, merge_results, query_many
+
+
+class MultiSearchTool:
+    """Query several :class:`BaseSearchTool` providers concurrently.
+
+    Requests go out in parallel over the shared client, so pool limits apply
+    across all providers.  Results are merged in provider order and
+    deduplicated by URL.
+    """
+
+    def __init__(self, tools: list[BaseSearchTool]):
+        self.tools = tools
+
+    async def query_all(
+        self,
+        query: str,
+        count: int | None = None,
+        *,
+        client: httpx.AsyncClient | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the merged results of every provider for ``query``."""
+        return merge_results(await query_many(self.tools, query, count, client=client))
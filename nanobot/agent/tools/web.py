@@ -58,7 +58,8 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, config: WebSearchConfig):
+    def __init__(self, config: WebSearchConfig | None = None):
+        config = config or WebSearchConfig()
         if config.provider == "baidu":
             from .search.baidu import BaiduSearchTool
             self._impl = BaiduSearchTool(config)
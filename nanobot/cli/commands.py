@@ -281,6 +281,7 @@ def gateway(
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
+    from nanobot.agent.tools.search.base import close_client
     from nanobot.channels.manager import ChannelManager
     from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
@@ -417,6 +418,7 @@ def gateway(
             console.print("\nShutting down...")
         finally:
             await agent.close_mcp()
+            await close_client()
             heartbeat.stop()
             cron.stop()
             agent.stop()
@@ -443,6 +445,7 @@ def agent(
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
+    from nanobot.agent.tools.search.base import close_client
     from nanobot.cron.service import CronService
     from loguru import logger
     
@@ -500,6 +503,7 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await close_client()
 
         asyncio.run(run_once())
     else:
@@ -595,6 +599,7 @@ def agent(
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
                 await agent_loop.close_mcp()
+                await close_client()
 
         asyncio.run(run_interactive())
 
@@ -249,6 +249,10 @@ class WebSearchConfig(Base):
     url_base: str = None  # Optional custom API base URL (overrides provider default)
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    connect_timeout: float = 3.0  # Seconds to establish the TCP/TLS connection
+    read_timeout: float = 10.0  # Seconds to wait for response data
+    write_timeout: float = 5.0  # Seconds to send the request body
+    pool_timeout: float = 2.0  # Seconds to wait for a free pooled connection
 
 
 class WebToolsConfig(Base):
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
@@ -11,7 +12,9 @@ from loguru import logger
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
 
-_HEARTBEAT_TOOL = [
+# Shared by every service as an immutable sequence; providers that need a list
+# take a shallow copy rather than deep-copying the definition.
+_HEARTBEAT_TOOL = (
     {
         "type": "function",
         "function": {
@@ -33,8 +36,18 @@ _HEARTBEAT_TOOL = [
                 "required": ["action"],
             },
         },
-    }
-]
+    },
+)
+
+
+# Kept byte-identical across calls so providers with prompt caching
+# (cache_control is injected by LiteLLMProvider) reuse the cached prefix.
+_HEARTBEAT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision.",
+}
+
+_DECISION_CACHE_SIZE = 64
 
 
 class HeartbeatService:
@@ -69,6 +82,12 @@ class HeartbeatService:
         self.enabled = enabled
         self._running = False
         self._task: asyncio.Task | None = None
+        self._tick_tasks: set[asyncio.Task] = set()  # Strong refs to in-flight ticks
+        self._inflight = asyncio.Semaphore(1)
+        self._wake = asyncio.Event()
+        self._last_stat: tuple[int, int] | None = None  # (st_mtime_ns, st_size)
+        self._last_decision: tuple[str, str] | None = None
+        self._decision_cache: dict[bytes, tuple[str, str]] = {}
 
     @property
     def heartbeat_file(self) -> Path:
@@ -89,7 +108,7 @@ class HeartbeatService:
         """
         response = await self.provider.chat(
             messages=[
-                {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
+                _HEARTBEAT_SYSTEM_MESSAGE,
                 {"role": "user", "content": (
                     "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
                     f"{content}"
@@ -105,49 +124,123 @@ class HeartbeatService:
         args = response.tool_calls[0].arguments
         return args.get("action", "skip"), args.get("tasks", "")
 
+    async def _decide_cached(self, content: str) -> tuple[str, str]:
+        """Return the decision for ``content``, reusing it for identical files."""
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        if (decision := self._decision_cache.get(digest)) is not None:
+            return decision
+        decision = await self._decide(content)
+        if len(self._decision_cache) >= _DECISION_CACHE_SIZE:
+            self._decision_cache.pop(next(iter(self._decision_cache)))
+        self._decision_cache[digest] = decision
+        return decision
+
     async def start(self) -> None:
         """Start the heartbeat service."""
         if not self.enabled:
             logger.info("Heartbeat disabled")
             return
-        if self._running:
+        if self._task is not None and not self._task.done():
             logger.warning("Heartbeat already running")
             return
 
         self._running = True
         self._task = asyncio.create_task(self._run_loop())
+        self._task.add_done_callback(self._on_loop_done)
         logger.info("Heartbeat started (every {}s)", self.interval_s)
 
+    def _on_loop_done(self, task: asyncio.Task) -> None:
+        # only forget our own task; a restart may already have replaced it
+        if self._task is task:
+            self._task = None
+
     def stop(self) -> None:
         """Stop the heartbeat service."""
         self._running = False
         if self._task:
             self._task.cancel()
             self._task = None
+        for task in list(self._tick_tasks):
+            task.cancel()
+
+    def wake(self) -> None:
+        """Run the next tick now instead of waiting for the interval to elapse."""
+        self._wake.set()
+
+    async def _wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True if woken early."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return False
+        self._wake.clear()
+        return True
 
     async def _run_loop(self) -> None:
-        """Main heartbeat loop."""
+        """Main heartbeat loop.
+
+        Ticks are scheduled against a monotonic deadline and run as background
+        tasks, so a slow LLM decision never delays the next heartbeat.
+        """
+        try:
+            await self._schedule_ticks()
+        finally:
+            if self._task in (None, asyncio.current_task()):
+                self._running = False
+
+    async def _schedule_ticks(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time() + self.interval_s
         while self._running:
             try:
-                await asyncio.sleep(self.interval_s)
+                woken = await self._wait(next_deadline - loop.time())
+                next_deadline = (loop.time() if woken else next_deadline) + self.interval_s
                 if self._running:
-                    await self._tick()
+                    task = asyncio.create_task(self._tick())
+                    self._tick_tasks.add(task)
+                    task.add_done_callback(self._tick_tasks.discard)
+                if next_deadline <= loop.time():
+                    # fell a whole period behind: skip missed ticks rather than burst
+                    next_deadline = loop.time() + self.interval_s
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Heartbeat error: {}", e)
 
     async def _tick(self) -> None:
-        """Execute a single heartbeat tick."""
-        content = self._read_heartbeat_file()
-        if not content:
+        """Execute a single heartbeat tick, unless the previous one is still running."""
+        if self._inflight.locked():
+            logger.debug("Heartbeat: previous tick still in flight, skipping")
+            return
+        async with self._inflight:
+            await self._tick_body()
+
+    async def _tick_body(self) -> None:
+        try:
+            st = await asyncio.to_thread(self.heartbeat_file.stat)
+        except OSError:
             logger.debug("Heartbeat: HEARTBEAT.md missing or empty")
             return
 
+        # Unchanged since the last decision: skip both the read and the LLM call.
+        # Size guards against rewrites landing within the mtime granularity.
+        stat_key = (st.st_mtime_ns, st.st_size)
+        cached = self._last_decision if stat_key == self._last_stat else None
+        content = None
+        if cached is None:
+            content = await asyncio.to_thread(self._read_heartbeat_file)
+            if not content:
+                logger.debug("Heartbeat: HEARTBEAT.md missing or empty")
+                return
+
         logger.info("Heartbeat: checking for tasks...")
 
         try:
-            action, tasks = await self._decide(content)
+            if cached is not None:
+                action, tasks = cached
+            else:
+                action, tasks = await self._decide_cached(content)
+                self._last_stat, self._last_decision = stat_key, (action, tasks)
 
             if action != "run":
                 logger.info("Heartbeat: OK (nothing to report)")
@@ -164,7 +257,7 @@ class HeartbeatService:
 
     async def trigger_now(self) -> str | None:
         """Manually trigger a heartbeat."""
-        content = self._read_heartbeat_file()
+        content = await asyncio.to_thread(self._read_heartbeat_file)
         if not content:
             return None
         action, tasks = await self._decide(content)
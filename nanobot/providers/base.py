@@ -1,11 +1,12 @@
 """Base LLM provider interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallRequest:
     """A tool call request from the LLM."""
     id: str
@@ -13,7 +14,7 @@ class ToolCallRequest:
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Response from an LLM provider."""
     content: str | None
@@ -84,7 +85,7 @@ class LLMProvider(ABC):
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[dict[str, Any]] | None = None,
         model: str | None = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
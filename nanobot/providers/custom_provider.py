@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
 import json_repair
@@ -17,7 +18,7 @@ class CustomProvider(LLMProvider):
         self.default_model = default_model
         self._client = AsyncOpenAI(api_key=api_key, base_url=api_base)
 
-    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+    async def chat(self, messages: list[dict[str, Any]], tools: Sequence[dict[str, Any]] | None = None,
                    model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
         kwargs: dict[str, Any] = {
             "model": model or self.default_model,
@@ -26,7 +27,7 @@ class CustomProvider(LLMProvider):
             "temperature": temperature,
         }
         if tools:
-            kwargs.update(tools=tools, tool_choice="auto")
+            kwargs.update(tools=list(tools), tool_choice="auto")
         try:
             return self._parse(await self._client.chat.completions.create(**kwargs))
         except Exception as e:
@@ -3,6 +3,7 @@
 import json
 import json_repair
 import os
+from collections.abc import Sequence
 from typing import Any
 
 import litellm
@@ -118,8 +119,8 @@ class LiteLLMProvider(LLMProvider):
     def _apply_cache_control(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None,
-    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+        tools: Sequence[dict[str, Any]] | None,
+    ) -> tuple[list[dict[str, Any]], Sequence[dict[str, Any]] | None]:
         """Return copies of messages and tools with cache_control injected."""
         new_messages = []
         for msg in messages:
@@ -166,7 +167,7 @@ class LiteLLMProvider(LLMProvider):
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[dict[str, Any]] | None = None,
         model: str | None = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
@@ -217,7 +218,7 @@ class LiteLLMProvider(LLMProvider):
             kwargs["extra_headers"] = self.extra_headers
         
         if tools:
-            kwargs["tools"] = tools
+            kwargs["tools"] = list(tools)  # LiteLLM expects a list, callers may pass a tuple
             kwargs["tool_choice"] = "auto"
         
         try:
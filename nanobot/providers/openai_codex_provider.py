@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+from collections.abc import Sequence
 from typing import Any, AsyncGenerator
 
 import httpx
@@ -27,7 +28,7 @@ class OpenAICodexProvider(LLMProvider):
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[dict[str, Any]] | None = None,
         model: str | None = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
@@ -111,7 +112,7 @@ async def _request_codex(
             return await _consume_sse(response)
 
 
-def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _convert_tools(tools: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert OpenAI function-calling schema to Codex flat format."""
     converted: list[dict[str, Any]] = []
     for tool in tools:
@@ -44,17 +44,22 @@ class Session:
     
     def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
         """Return unconsolidated messages for LLM input, aligned to a user turn."""
-        unconsolidated = self.messages[self.last_consolidated:]
-        sliced = unconsolidated[-max_messages:]
+        # Find the start index first so only the returned tail is walked once,
+        # instead of slicing the unconsolidated tail and then re-slicing it.
+        messages = self.messages
+        start = self.last_consolidated
+        if max_messages > 0:
+            start = max(start, len(messages) - max_messages)
 
         # Drop leading non-user messages to avoid orphaned tool_result blocks
-        for i, m in enumerate(sliced):
-            if m.get("role") == "user":
-                sliced = sliced[i:]
+        for i in range(start, len(messages)):
+            if messages[i].get("role") == "user":
+                start = i
                 break
 
         out: list[dict[str, Any]] = []
-        for m in sliced:
+        for i in range(start, len(messages)):
+            m = messages[i]
             entry: dict[str, Any] = {"role": m["role"], "content": m.get("content", "")}
             for k in ("tool_calls", "tool_call_id", "name"):
                 if k in m:
@@ -121,6 +121,22 @@ class TestSessionImmutableHistory:
         assert len(history) == 5
         assert history[0]["content"] == "msg0"
 
+    def test_get_history_skips_consolidated_and_aligns_to_user(self) -> None:
+        """Test get_history starts after last_consolidated at the first user turn."""
+        session = Session(key="test:align")
+        for i in range(5):
+            session.add_message("user", f"msg{i}")
+            session.add_message("assistant", f"resp{i}")
+        session.last_consolidated = 3
+
+        history = session.get_history(max_messages=100)
+        assert history[0]["content"] == "msg2"
+        assert len(history) == 6
+
+        history = session.get_history(max_messages=3)
+        assert history[0]["content"] == "msg4"
+        assert len(history) == 2
+
     def test_get_history_stable_for_same_session(self) -> None:
         """Test that get_history returns same content for same max_messages."""
         session = create_session_with_messages("test:stable", 20)
@@ -1,35 +1,35 @@
 import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from nanobot.heartbeat.service import (
-    HEARTBEAT_OK_TOKEN,
-    HeartbeatService,
-)
+from nanobot.heartbeat.service import HeartbeatService
+from nanobot.providers.base import LLMResponse, ToolCallRequest
 
 
-def test_heartbeat_ok_detection() -> None:
-    def is_ok(response: str) -> bool:
-        return HEARTBEAT_OK_TOKEN in response.upper()
-
-    assert is_ok("HEARTBEAT_OK")
-    assert is_ok("`HEARTBEAT_OK`")
-    assert is_ok("**HEARTBEAT_OK**")
-    assert is_ok("heartbeat_ok")
-    assert is_ok("HEARTBEAT_OK.")
-
-    assert not is_ok("HEARTBEAT_NOT_OK")
-    assert not is_ok("all good")
+def _make_provider(action: str = "skip", tasks: str = "") -> MagicMock:
+    provider = MagicMock()
+    provider.chat = AsyncMock(
+        return_value=LLMResponse(
+            content=None,
+            tool_calls=[
+                ToolCallRequest(
+                    id="call_1",
+                    name="heartbeat",
+                    arguments={"action": action, "tasks": tasks},
+                )
+            ],
+        )
+    )
+    return provider
 
 
 @pytest.mark.asyncio
 async def test_start_is_idempotent(tmp_path) -> None:
-    async def _on_heartbeat(_: str) -> str:
-        return "HEARTBEAT_OK"
-
     service = HeartbeatService(
         workspace=tmp_path,
-        on_heartbeat=_on_heartbeat,
+        provider=_make_provider(),
+        model="test-model",
         interval_s=9999,
         enabled=True,
     )
@@ -42,3 +42,169 @@ async def test_start_is_idempotent(tmp_path) -> None:
 
     service.stop()
     await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_start_restarts_after_loop_task_dies(tmp_path) -> None:
+    service = HeartbeatService(
+        workspace=tmp_path, provider=_make_provider(), model="test-model", interval_s=9999,
+    )
+
+    await service.start()
+    first_task = service._task
+    await asyncio.sleep(0)
+    first_task.cancel()
+    await asyncio.gather(first_task, return_exceptions=True)
+
+    assert service._task is None
+    assert not service._running
+
+    await service.start()
+    assert service._task is not None and service._task is not first_task
+    assert service._running
+
+    service.stop()
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_stop_then_start_keeps_new_loop_running(tmp_path) -> None:
+    service = HeartbeatService(
+        workspace=tmp_path, provider=_make_provider(), model="test-model", interval_s=9999,
+    )
+
+    await service.start()
+    service.stop()
+    await service.start()
+    await asyncio.sleep(0.01)
+
+    assert service._running
+    assert service._task is not None and not service._task.done()
+
+    service.stop()
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_run_loop_keeps_cadence_despite_slow_ticks(tmp_path) -> None:
+    service = HeartbeatService(
+        workspace=tmp_path, provider=_make_provider(), model="test-model", interval_s=0.1,
+    )
+    loop = asyncio.get_running_loop()
+    starts: list[float] = []
+
+    async def slow_tick() -> None:
+        starts.append(loop.time())
+        await asyncio.sleep(0.06)
+
+    service._tick = slow_tick
+    await service.start()
+    await asyncio.sleep(0.55)
+    service.stop()
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(gaps) >= 3
+    assert all(gap < 0.15 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_ticks_are_skipped(tmp_path) -> None:
+    service = HeartbeatService(
+        workspace=tmp_path, provider=_make_provider(), model="test-model", interval_s=0.05,
+    )
+    bodies = 0
+
+    async def slow_body() -> None:
+        nonlocal bodies
+        bodies += 1
+        await asyncio.sleep(0.3)
+
+    service._tick_body = slow_body
+    await service.start()
+    await asyncio.sleep(0.5)
+    service.stop()
+
+    assert bodies == 2
+
+
+@pytest.mark.asyncio
+async def test_wake_runs_tick_before_interval(tmp_path) -> None:
+    service = HeartbeatService(
+        workspace=tmp_path, provider=_make_provider(), model="test-model", interval_s=9999,
+    )
+    ticked = asyncio.Event()
+
+    async def tick() -> None:
+        ticked.set()
+
+    service._tick = tick
+    await service.start()
+    service.wake()
+    await asyncio.wait_for(ticked.wait(), timeout=1.0)
+    service.stop()
+
+
+@pytest.mark.asyncio
+async def test_tick_reuses_decision_while_file_unchanged(tmp_path) -> None:
+    hb = tmp_path / "HEARTBEAT.md"
+    hb.write_text("- [ ] water plants", encoding="utf-8")
+    provider = _make_provider("run", "water plants")
+    on_execute = AsyncMock(return_value="")
+    service = HeartbeatService(
+        workspace=tmp_path, provider=provider, model="test-model", on_execute=on_execute,
+    )
+
+    await service._tick()
+    await service._tick()
+
+    assert provider.chat.await_count == 1
+    assert on_execute.await_count == 2
+
+    hb.write_text("- [ ] feed cat", encoding="utf-8")
+    await service._tick()
+
+    assert provider.chat.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tick_reuses_decision_for_identical_content(tmp_path) -> None:
+    hb = tmp_path / "HEARTBEAT.md"
+    provider = _make_provider()
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="test-model")
+
+    for text in ("same", "other", "same"):
+        hb.write_text(text, encoding="utf-8")
+        await service._tick()
+
+    assert provider.chat.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tick_skips_missing_file(tmp_path) -> None:
+    provider = _make_provider()
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="test-model")
+
+    await service._tick()
+
+    provider.chat.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_tool_is_frozen_and_accepted_by_litellm(monkeypatch) -> None:
+    from nanobot.heartbeat.service import _HEARTBEAT_TOOL
+    from nanobot.providers import litellm_provider
+
+    captured: dict = {}
+
+    async def fake_acompletion(**kwargs):
+        captured.update(kwargs)
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    provider = litellm_provider.LiteLLMProvider(api_key="k", default_model="openai/gpt-4o")
+
+    await provider.chat(messages=[{"role": "user", "content": "hi"}], tools=_HEARTBEAT_TOOL)
+
+    assert isinstance(_HEARTBEAT_TOOL, tuple)
+    assert isinstance(captured["tools"], list)
+    assert captured["tools"][0]["function"]["name"] == "heartbeat"
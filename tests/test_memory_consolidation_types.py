@@ -5,25 +5,65 @@ When memory consolidation receives dict values instead of strings from the LLM
 tool call response, it should serialize them to JSON instead of raising TypeError.
 """
 
+import asyncio
 import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.utils.helpers import ensure_dir
 
 
-def _make_session(message_count: int = 30, memory_window: int = 50):
-    """Create a mock session with messages."""
-    session = MagicMock()
-    session.messages = [
-        {"role": "user", "content": f"msg{i}", "timestamp": "2026-01-01 00:00"}
-        for i in range(message_count)
-    ]
-    session.last_consolidated = 0
-    return session
+@dataclass(slots=True)
+class _FakeSession:
+    messages: list[dict]
+    last_consolidated: int = 0
+
+
+_TS = datetime(2026, 1, 1, 0, 0)
+_MESSAGE_TEMPLATE = {"role": "user", "content": "", "timestamp": _TS}
+
+
+def _make_messages(message_count: int) -> list[dict]:
+    return [{**_MESSAGE_TEMPLATE, "content": f"msg{i}"} for i in range(message_count)]
+
+
+def _make_session(message_count: int = 30, memory_window: int = 50) -> _FakeSession:
+    """Create a lightweight session with messages."""
+    return _FakeSession(messages=_make_messages(message_count))
+
+
+@pytest.fixture(scope="session")
+def _proto_store(tmp_path_factory: pytest.TempPathFactory) -> MemoryStore:
+    return MemoryStore(tmp_path_factory.mktemp("proto"))
+
+
+@pytest.fixture
+def store(tmp_path: Path, _proto_store: MemoryStore) -> MemoryStore:
+    """The shared MemoryStore, pointed at this test's tmp_path with empty caches."""
+    _proto_store.memory_dir = ensure_dir(tmp_path / "memory")
+    _proto_store.memory_file = _proto_store.memory_dir / "MEMORY.md"
+    _proto_store.history_file = _proto_store.memory_dir / "HISTORY.md"
+    _proto_store.reload()
+    _proto_store._consolidation_cache.clear()
+    return _proto_store
+
+
+@pytest.fixture(scope="module")
+def big_session_template() -> list[dict]:
+    """60 messages built once per module; consolidate() never mutates the dicts."""
+    return _make_messages(60)
+
+
+@pytest.fixture
+def session(big_session_template: list[dict]) -> _FakeSession:
+    return _FakeSession(messages=list(big_session_template))
 
 
 def _make_tool_response(history_entry, memory_update):
@@ -43,41 +83,48 @@ def _make_tool_response(history_entry, memory_update):
     )
 
 
+class _StubProvider:
+    """Minimal provider whose chat() returns a fixed response and records its kwargs."""
+
+    def __init__(self, response: LLMResponse | None = None):
+        self.response = response
+        self.calls: list[dict] = []
+
+    async def chat(self, **kwargs) -> LLMResponse | None:
+        self.calls.append(kwargs)
+        return self.response
+
+
 class TestMemoryConsolidationTypeHandling:
     """Test that consolidation handles various argument types correctly."""
 
-    @pytest.mark.asyncio
-    async def test_string_arguments_work(self, tmp_path: Path) -> None:
+    async def test_string_arguments_work(self, store: MemoryStore, session: _FakeSession) -> None:
         """Normal case: LLM returns string arguments."""
-        store = MemoryStore(tmp_path)
-        provider = AsyncMock()
-        provider.chat = AsyncMock(
-            return_value=_make_tool_response(
+        provider = _StubProvider(
+            _make_tool_response(
                 history_entry="[2026-01-01] User discussed testing.",
                 memory_update="# Memory\nUser likes testing.",
             )
         )
-        session = _make_session(message_count=60)
 
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
         assert result is True
+        assert "[2026-01-01T00:00] USER: msg0\n" in provider.calls[0]["messages"][1]["content"]
         assert store.history_file.exists()
         assert "[2026-01-01] User discussed testing." in store.history_file.read_text()
         assert "User likes testing." in store.memory_file.read_text()
 
-    @pytest.mark.asyncio
-    async def test_dict_arguments_serialized_to_json(self, tmp_path: Path) -> None:
+    async def test_dict_arguments_serialized_to_json(
+        self, store: MemoryStore, session: _FakeSession
+    ) -> None:
         """Issue #1042: LLM returns dict instead of string — must not raise TypeError."""
-        store = MemoryStore(tmp_path)
-        provider = AsyncMock()
-        provider.chat = AsyncMock(
-            return_value=_make_tool_response(
+        provider = _StubProvider(
+            _make_tool_response(
                 history_entry={"timestamp": "2026-01-01", "summary": "User discussed testing."},
                 memory_update={"facts": ["User likes testing"], "topics": ["testing"]},
             )
         )
-        session = _make_session(message_count=60)
 
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
@@ -91,12 +138,10 @@ class TestMemoryConsolidationTypeHandling:
         parsed_mem = json.loads(memory_content)
         assert "User likes testing" in parsed_mem["facts"]
 
-    @pytest.mark.asyncio
-    async def test_string_arguments_as_raw_json(self, tmp_path: Path) -> None:
+    async def test_string_arguments_as_raw_json(
+        self, store: MemoryStore, session: _FakeSession
+    ) -> None:
         """Some providers return arguments as a JSON string instead of parsed dict."""
-        store = MemoryStore(tmp_path)
-        provider = AsyncMock()
-
         # Simulate arguments being a JSON string (not yet parsed)
         response = LLMResponse(
             content=None,
@@ -111,37 +156,201 @@ class TestMemoryConsolidationTypeHandling:
                 )
             ],
         )
-        provider.chat = AsyncMock(return_value=response)
-        session = _make_session(message_count=60)
+        provider = _StubProvider(response)
 
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
         assert result is True
         assert "User discussed testing." in store.history_file.read_text()
 
-    @pytest.mark.asyncio
-    async def test_no_tool_call_returns_false(self, tmp_path: Path) -> None:
+    async def test_no_tool_call_returns_false(
+        self, store: MemoryStore, session: _FakeSession
+    ) -> None:
         """When LLM doesn't use the save_memory tool, return False."""
-        store = MemoryStore(tmp_path)
-        provider = AsyncMock()
-        provider.chat = AsyncMock(
-            return_value=LLMResponse(content="I summarized the conversation.", tool_calls=[])
+        provider = _StubProvider(
+            LLMResponse(content="I summarized the conversation.", tool_calls=[])
         )
-        session = _make_session(message_count=60)
 
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
         assert result is False
         assert not store.history_file.exists()
 
-    @pytest.mark.asyncio
-    async def test_skips_when_few_messages(self, tmp_path: Path) -> None:
+    async def test_skips_when_few_messages(self, store: MemoryStore) -> None:
         """Consolidation should be a no-op when messages < keep_count."""
-        store = MemoryStore(tmp_path)
-        provider = AsyncMock()
+        provider = _StubProvider()
         session = _make_session(message_count=10)
 
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
         assert result is True
-        provider.chat.assert_not_called()
+        assert provider.calls == []
+
+    async def test_dict_arguments_keep_non_ascii_and_int_keys(
+        self, store: MemoryStore, session: _FakeSession
+    ) -> None:
+        """Serialized dict arguments stay readable UTF-8 and tolerate non-string keys."""
+        provider = _StubProvider(
+            _make_tool_response(
+                history_entry={"summary": "用户讨论了测试"},
+                memory_update={1: "first", "facts": ["喜欢测试"]},
+            )
+        )
+
+        result = await store.consolidate(session, provider, "test-model", memory_window=50)
+
+        assert result is True
+        assert "用户讨论了测试" in store.history_file.read_text(encoding="utf-8")
+        memory_text = store.memory_file.read_text(encoding="utf-8")
+        assert json.loads(memory_text) == {"1": "first", "facts": ["喜欢测试"]}
+        assert memory_text.endswith("}\n")
+
+    def test_dict_serialization_is_key_order_independent(self) -> None:
+        from nanobot.agent.memory import _to_json
+
+        text = _to_json({"b": 1, "a": [2]})
+        assert text == _to_json({"a": [2], "b": 1})
+        assert text.startswith('{"a"') and text.endswith("}\n")
+
+    async def test_invalid_raw_json_arguments_return_false(
+        self, store: MemoryStore, session: _FakeSession
+    ) -> None:
+        """Unparseable string arguments fail the consolidation instead of raising."""
+        provider = _StubProvider(
+            LLMResponse(
+                content=None,
+                tool_calls=[ToolCallRequest(id="call_1", name="save_memory", arguments="{not json")],
+            )
+        )
+
+        result = await store.consolidate(session, provider, "test-model", memory_window=50)
+
+        assert result is False
+        assert not store.history_file.exists()
+
+        # Malformed arguments are not cached, so a retry asks the LLM again
+        await store.consolidate(session, provider, "test-model", memory_window=50)
+        assert len(provider.calls) == 2
+
+    async def test_identical_retry_reuses_cached_response(
+        self, store: MemoryStore, session: _FakeSession, monkeypatch
+    ) -> None:
+        """A retried consolidation with the same prompt does not call the LLM again."""
+        provider = _StubProvider(
+            _make_tool_response(
+                history_entry="[2026-01-01] User discussed testing.",
+                memory_update="# Memory\nUser likes testing.",
+            )
+        )
+        failing_write = MagicMock(side_effect=OSError("disk full"))
+        monkeypatch.setattr(MemoryStore, "write_long_term", failing_write)
+
+        assert await store.consolidate(session, provider, "test-model", memory_window=50) is False
+
+        monkeypatch.undo()
+        assert await store.consolidate(session, provider, "test-model", memory_window=50) is True
+        assert len(provider.calls) == 1
+        assert "User likes testing." in store.memory_file.read_text()
+        # The history entry landed on the first attempt and is not appended again
+        assert store.history_file.read_text() == "[2026-01-01] User discussed testing.\n\n"
+
+    async def test_offline_encoding_falls_back_off_the_event_loop(
+        self, store: MemoryStore, session: _FakeSession, monkeypatch
+    ) -> None:
+        """A failed BPE download falls back to the estimate; counting runs in a thread."""
+        tiktoken = pytest.importorskip("tiktoken")
+        from nanobot.agent import memory
+
+        def offline(*args, **kwargs):
+            raise ConnectionError("offline")
+
+        monkeypatch.setattr(tiktoken, "encoding_for_model", offline)
+        monkeypatch.setattr(tiktoken, "get_encoding", offline)
+        memory._encoding.cache_clear()
+        threads: set[int] = set()
+        count_tokens = memory._count_tokens
+
+        def recording_count(enc, text):
+            threads.add(threading.get_ident())
+            return count_tokens(enc, text)
+
+        monkeypatch.setattr(memory, "_count_tokens", recording_count)
+        provider = _StubProvider(_make_tool_response("[2026-01-01] entry", "# Memory"))
+
+        try:
+            result = await store.consolidate(session, provider, "openai/gpt-4o", memory_window=50)
+        finally:
+            memory._encoding.cache_clear()
+
+        assert result is True
+        assert threads and threading.get_ident() not in threads
+
+    async def test_token_budget_limits_consolidation_window(
+        self, store: MemoryStore, session: _FakeSession, monkeypatch
+    ) -> None:
+        """Messages past the token budget are left for the next consolidation."""
+        from nanobot.agent import memory
+
+        monkeypatch.setattr(memory, "_encoding", lambda model: None)
+        monkeypatch.setattr(memory, "_CONSOLIDATION_TOKEN_BUDGET", 60)
+        provider = _StubProvider(
+            _make_tool_response(
+                history_entry="[2026-01-01] User discussed testing.",
+                memory_update="# Memory\nUser likes testing.",
+            )
+        )
+
+        result = await store.consolidate(session, provider, "test-model", memory_window=50)
+
+        assert result is True
+        prompt = provider.calls[-1]["messages"][1]["content"]
+        assert prompt.endswith("USER: msg6")
+        assert session.last_consolidated == 7
+
+
+def test_long_term_memory_is_mirrored_until_file_changes(store: MemoryStore, monkeypatch) -> None:
+    store.write_long_term("# Memory\nfirst")
+
+    monkeypatch.setattr(Path, "read_text", MagicMock(side_effect=AssertionError("read from disk")))
+    assert store.read_long_term() == "# Memory\nfirst"
+    monkeypatch.undo()
+
+    store.memory_file.write_text("# Memory\nedited by a tool", encoding="utf-8")
+    assert store.read_long_term() == "# Memory\nedited by a tool"
+
+    store.memory_file.unlink()
+    assert store.read_long_term() == ""
+
+
+async def test_concurrent_consolidations_are_bounded(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path, max_parallel_consolidations=2)
+    in_flight = peak = 0
+
+    async def chat(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _make_tool_response("[2026-01-01] entry", "# Memory")
+
+    provider = _StubProvider()
+    provider.chat = chat
+    sessions = [_make_session(message_count=60) for _ in range(5)]
+
+    results = await asyncio.gather(*(
+        store.consolidate(s, provider, f"model-{i}", memory_window=50)
+        for i, s in enumerate(sessions)
+    ))
+
+    assert all(results)
+    assert peak == 2
+
+
+async def test_concurrent_history_appends_do_not_interleave(store: MemoryStore) -> None:
+    entries = [f"[2026-01-01] entry {i} " + str(i) * 20000 for i in range(8)]
+
+    await asyncio.gather(*(asyncio.to_thread(store.append_history, e) for e in entries))
+
+    written = store.history_file.read_text(encoding="utf-8").split("\n\n")
+    assert sorted(written[:-1]) == sorted(entries)
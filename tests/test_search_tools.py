@@ -0,0 +1,412 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from loguru import logger
+
+from nanobot.agent.tools.search import MultiSearchTool
+from nanobot.agent.tools.search import baidu as baidu_module
+from nanobot.agent.tools.search import base as search_base
+from nanobot.agent.tools.search.baidu import BaiduSearchTool
+from nanobot.agent.tools.search.brave import BraveSearchTool
+from nanobot.agent.tools.search.dns import CachingDNSBackend
+from nanobot.config.schema import WebSearchConfig
+
+
+@pytest.fixture(autouse=True)
+async def _reset_search_state():
+    await search_base.close_client()
+    search_base._query_cache.clear()
+    yield
+    await search_base.close_client()
+    search_base._query_cache.clear()
+
+
+def _brave(**kwargs) -> BraveSearchTool:
+    return BraveSearchTool(WebSearchConfig(provider="brave", api_key="test-key", **kwargs))
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_across_queries(monkeypatch) -> None:
+    seen: list[httpx.AsyncClient] = []
+
+    async def fake_request(self, client, headers, body):
+        seen.append(client)
+        return [{"title": body["q"], "url": "https://example.com"}]
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+    tool = _brave()
+
+    await tool.query("a")
+    await tool.query("b")
+
+    assert len(seen) == 2
+    assert seen[0] is seen[1]
+    assert not seen[0].is_closed
+
+
+@pytest.mark.asyncio
+async def test_query_uses_injected_client_without_closing_it(monkeypatch) -> None:
+    seen: list[httpx.AsyncClient] = []
+
+    async def fake_request(self, client, headers, body):
+        seen.append(client)
+        return []
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+
+    async with httpx.AsyncClient() as client:
+        await _brave().queryStringify("q", client=client)
+        assert seen == [client]
+        assert not client.is_closed
+    assert search_base._CLIENT is None
+
+
+@pytest.mark.asyncio
+async def test_close_client_recreates_on_next_use() -> None:
+    first = await search_base.get_client()
+    await search_base.close_client()
+    second = await search_base.get_client()
+
+    assert first.is_closed
+    assert second is not first
+
+
+@pytest.mark.asyncio
+async def test_shared_client_pool_is_bounded_under_fan_out(monkeypatch) -> None:
+    seen: set[int] = set()
+
+    async def fake_request(self, client, headers, body):
+        seen.add(id(client))
+        await asyncio.sleep(0)
+        return []
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+    tool = _brave()
+
+    await asyncio.gather(*(tool.query(f"q{i}") for i in range(50)))
+
+    pool = (await search_base.get_client())._transport._pool
+    assert len(seen) == 1
+    assert pool._http2
+    assert pool._max_connections == 100
+    assert pool._max_keepalive_connections == 20
+    assert len(pool._connections) <= pool._max_connections
+
+
+@pytest.mark.asyncio
+async def test_shared_client_honours_environment_proxies(monkeypatch) -> None:
+    for var in ("ALL_PROXY", "all_proxy", "HTTP_PROXY", "http_proxy", "https_proxy", "no_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.local:8080")
+    monkeypatch.setenv("NO_PROXY", "internal.local")
+
+    client = await search_base.get_client()
+
+    proxied = client._transport_for_url(httpx.URL("https://api.search.brave.com/"))
+    assert proxied is not client._transport
+    assert proxied._pool._proxy_url.host == b"proxy.local"
+    assert client._transport_for_url(httpx.URL("https://internal.local/")) is client._transport
+
+
+@pytest.mark.asyncio
+async def test_shared_client_keeps_proxies_without_private_helper(monkeypatch) -> None:
+    for var in ("ALL_PROXY", "all_proxy", "HTTP_PROXY", "http_proxy", "https_proxy", "no_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.local:8080")
+    monkeypatch.setattr(search_base, "get_environment_proxies", None)
+
+    client = await search_base.get_client()
+
+    proxied = client._transport_for_url(httpx.URL("https://api.search.brave.com/"))
+    assert proxied is not client._transport
+    assert isinstance(client._transport._pool._network_backend, CachingDNSBackend)
+
+
+@pytest.mark.asyncio
+async def test_dns_backend_caches_lookups(monkeypatch) -> None:
+    backend = CachingDNSBackend(ttl=60.0)
+    lookups: list[str] = []
+
+    async def fake_lookup(host: str) -> str:
+        lookups.append(host)
+        return "10.0.0.1"
+
+    monkeypatch.setattr(backend, "_lookup", fake_lookup)
+
+    assert await backend.resolve("api.search.brave.com") == "10.0.0.1"
+    assert await backend.resolve("api.search.brave.com") == "10.0.0.1"
+    assert await backend.resolve("127.0.0.1") == "127.0.0.1"
+    assert lookups == ["api.search.brave.com"]
+
+    backend._ttl = 0.0
+    backend._cache.clear()
+    await backend.resolve("api.search.brave.com")
+    await backend.resolve("api.search.brave.com")
+    assert len(lookups) == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_client_uses_dns_cache() -> None:
+    client = await search_base.get_client()
+
+    assert isinstance(client._transport._pool._network_backend, CachingDNSBackend)
+
+
+def test_dns_cache_install_tolerates_unknown_transport_layout() -> None:
+    transport = search_base._make_transport()
+    pool = transport._pool
+    transport._pool = object()
+
+    search_base._install_dns_cache(transport)
+
+    assert not isinstance(pool._network_backend, CachingDNSBackend)
+
+
+def test_url_base_defaults_per_provider_and_can_be_overridden() -> None:
+    assert _brave().url_base == "https://api.search.brave.com/res/v1/web/search"
+    assert BaiduSearchTool(WebSearchConfig(provider="baidu")).url_base.startswith(
+        "https://qianfan.baidubce.com/"
+    )
+    assert _brave(url_base="https://proxy.local/search").url_base == "https://proxy.local/search"
+
+
+def test_timeouts_are_configurable_per_stage() -> None:
+    tool = _brave(connect_timeout=1.5, read_timeout=20.0)
+
+    assert tool.timeout == httpx.Timeout(connect=1.5, read=20.0, write=5.0, pool=2.0)
+    assert _brave().timeout == search_base.SEARCH_TIMEOUT
+
+
+@pytest.mark.asyncio
+async def test_identical_queries_are_cached_and_coalesced(monkeypatch) -> None:
+    calls = 0
+
+    async def fake_request(self, client, headers, body):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [{"title": body["q"], "url": "https://example.com"}]
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+    tool = _brave()
+
+    results = await asyncio.gather(*(tool.query("same", 3) for _ in range(10)))
+    again = await tool.query("same", 3)
+
+    assert calls == 1
+    assert all(r == again for r in results)
+
+    await tool.query("same", 4)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_per_endpoint_and_isolated_from_callers(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def fake_request(self, client, headers, body):
+        calls.append(self.url_base)
+        return [{"title": "t", "url": "https://example.com", "meta": {"k": 1}}]
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+    default, proxied = _brave(), _brave(url_base="https://proxy.local/search")
+
+    first = await default.query("q")
+    await proxied.query("q")
+    assert calls == [default.url_base, "https://proxy.local/search"]
+
+    first[0]["meta"]["k"] = 2
+    first.append({"url": "https://junk"})
+    assert await default.query("q") == [
+        {"title": "t", "url": "https://example.com", "meta": {"k": 1}}
+    ]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_results_expire(monkeypatch) -> None:
+    calls = 0
+
+    async def fake_request(self, client, headers, body):
+        nonlocal calls
+        calls += 1
+        return []
+
+    monkeypatch.setattr(BraveSearchTool, "request", fake_request)
+    monkeypatch.setattr(search_base, "_QUERY_CACHE_TTL", 0.0)
+    tool = _brave()
+
+    await tool.query("q")
+    await tool.query("q")
+
+    assert calls == 2
+
+
+@pytest.fixture(params=["stream", "buffered"])
+def baidu_parse_mode(request, monkeypatch):
+    if request.param == "stream":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(baidu_module, "ijson", None)
+    return request.param
+
+
+@pytest.mark.asyncio
+async def test_baidu_request_normalizes_references(baidu_parse_mode) -> None:
+    payload = {
+        "references": [
+            {"title": "标题", "url": "https://a", "content": "内容", "date": "2026-01-01"},
+            {"title": "b", "url": "https://b", "meta": {"nested": [1, 2]}},
+        ]
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=payload)
+
+    tool = BaiduSearchTool(WebSearchConfig(provider="baidu", api_key="k"))
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await tool.request(client, tool.headers(), tool.body("q", 5))
+
+    assert results == [
+        {"icon": "", "date": "2026-01-01", "title": "标题", "url": "https://a", "description": "内容"},
+        {"icon": "", "date": "", "title": "b", "url": "https://b", "description": ""},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_baidu_request_raises_on_error_code(baidu_parse_mode) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"code": 216003, "message": "bad key"})
+
+    tool = BaiduSearchTool(WebSearchConfig(provider="baidu", api_key="k"))
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(Exception, match="216003: bad key"):
+            await tool.request(client, tool.headers(), tool.body("q"))
+
+
+@pytest.mark.asyncio
+async def test_baidu_stream_keeps_top_k_and_drains_body() -> None:
+    pytest.importorskip("ijson")
+    raw = json.dumps({"references": [{"url": f"https://{i}"} for i in range(20)]}).encode()
+
+    consumed = 0
+
+    async def chunks():
+        nonlocal consumed
+        for i in range(0, len(raw), 16):
+            consumed += 16
+            yield raw[i:i + 16]
+
+    results = await BaiduSearchTool._parse_stream(chunks(), 3)
+
+    assert [r["url"] for r in results] == ["https://0", "https://1", "https://2"]
+    assert consumed >= len(raw)  # drained so the connection can be reused
+
+
+@pytest.mark.asyncio
+async def test_query_retries_server_errors(monkeypatch) -> None:
+    statuses = iter([503, 502, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), json={"web": {"results": [{"url": "https://a"}]}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(search_base, "_CLIENT", client)
+    monkeypatch.setattr(search_base, "_RETRY_BASE_DELAY", 0.0)
+
+    assert await _brave().query("q") == [{"url": "https://a"}]
+
+
+@pytest.mark.asyncio
+async def test_query_does_not_retry_client_errors(monkeypatch) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(401)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(search_base, "_CLIENT", client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await _brave().query("q")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_brave_request_extracts_web_results() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["q"] == "q"
+        return httpx.Response(200, json={"web": {"results": [{"url": "https://a"}]}})
+
+    tool = _brave()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await tool.request(client, tool.headers(), tool.body("q"))
+
+    assert results == [{"url": "https://a"}]
+
+
+@pytest.mark.asyncio
+async def test_query_stringify_format(monkeypatch) -> None:
+    async def fake_query(self, query, count=None, **kwargs):
+        return [
+            {"title": "A", "url": "https://a", "description": "first"},
+            {"title": "B", "url": "https://b"},
+        ]
+
+    monkeypatch.setattr(BraveSearchTool, "query", fake_query)
+
+    text = await _brave().queryStringify("q")
+
+    assert text == "Results for: q\n\n1. A\n   https://a\n   first\n2. B\n   https://b"
+
+
+class _StubSearch(search_base.BaseSearchTool):
+    def __init__(self, name: str, results=None, error: Exception | None = None, delay: float = 0.0):
+        super().__init__(WebSearchConfig(provider=name, api_key="k"))
+        self._results = results or []
+        self._error = error
+        self._delay = delay
+
+    async def query(self, query, count=None, **kwargs):
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return self._results
+
+    async def request(self, client, headers, body):
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_multi_search_merges_dedupes_and_ignores_failures() -> None:
+    multi = MultiSearchTool([
+        _StubSearch("a", [{"url": "https://x"}, {"url": "https://y"}]),
+        _StubSearch("b", error=RuntimeError("boom")),
+        _StubSearch("c", [{"url": "https://y"}, {"url": "https://z"}]),
+    ])
+
+    messages: list[str] = []
+    sink = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        results = await multi.query_all("q")
+    finally:
+        logger.remove(sink)
+
+    assert [r["url"] for r in results] == ["https://x", "https://y", "https://z"]
+    assert len(messages) == 1 and "b" in messages[0] and "boom" in messages[0]
+
+
+@pytest.mark.asyncio
+async def test_multi_search_runs_providers_concurrently() -> None:
+    multi = MultiSearchTool([_StubSearch(str(i), delay=0.2) for i in range(5)])
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await multi.query_all("q")
+
+    assert loop.time() - start < 0.5